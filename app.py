@@ -1,13 +1,23 @@
+import dataclasses
+
 import streamlit as st
 import pandas as pd
 import requests
-import json
 from src.domain.entities import ExposureType, Loan
 
 # --- FastAPI Backend Configuration ---
 # Make sure the API is running on this port (via uvicorn)
 API_URL = "http://127.0.0.1:8000"
 
+# One Session per server process: Streamlit re-executes this script on
+# every interaction, so a plain module-level Session would be rebuilt
+# (and its connection pool discarded) on each rerun. cache_resource keeps
+# the same instance alive across reruns, so the TCP connection to the
+# backend is actually reused.
+@st.cache_resource
+def _get_session() -> requests.Session:
+    return requests.Session()
+
 # --- UI Scenario Configuration ---
 SCENARIOS_INFO = {
     "baseline": "Baseline (Stable growth, no shock applied)",
@@ -19,10 +29,12 @@ SCENARIOS_INFO = {
 def call_api(endpoint: str, data: dict, scenario: str):
     """Performs a POST request to the FastAPI endpoint safely."""
     try:
-        response = requests.post(
-            f"{API_URL}/{endpoint}?scenario={scenario}",
-            data=json.dumps(data),
-            headers={'Content-Type': 'application/json'},
+        # json= lets requests handle encoding and the Content-Type header;
+        # params= keeps the scenario out of manual string formatting.
+        response = _get_session().post(
+            f"{API_URL}/{endpoint}",
+            params={'scenario': scenario},
+            json=data,
             timeout=10
         )
         if response.status_code == 200:
@@ -64,9 +76,9 @@ turnover = st.sidebar.number_input("5. Turnover (€)", value=10_000_000)
 # Exposure type as string (e.g. 'CORPORATE')
 exposure_type_str = st.sidebar.selectbox("6. Exposure Type", options=[e.value for e in ExposureType])
 
-# Validation and creation of Loan object
+# Creation of the Loan object. Loan is a plain dataclass, so no field
+# validation happens here — the API validates the payload on ingress.
 try:
-    # Convert string to Enum for Pydantic
     exposure_type_enum = ExposureType(exposure_type_str)
 
     loan_data = Loan(
@@ -80,11 +92,12 @@ try:
     )
 
     # Build final JSON payload: {"loans": [{...}]}
-    # model_dump() converts Pydantic object into a clean dict (including enums)
-    portfolio_payload = {"loans": [loan_data.model_dump()]}
+    # asdict() converts the Loan dataclass into a clean dict; the enum's
+    # str value serializes as-is
+    portfolio_payload = {"loans": [dataclasses.asdict(loan_data)]}
 
 except Exception as e:
-    st.error(f"Data validation error (Pydantic): {e}")
+    st.error(f"Loan construction error: {e}")
     st.stop()
 
 
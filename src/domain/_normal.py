@@ -0,0 +1,59 @@
+"""
+Scalar standard-normal CDF / inverse-CDF without scipy.
+
+scipy.stats.norm.ppf/cdf in scalar mode pays the full rv_continuous
+dispatch (argument parsing, array coercion) per call — microseconds of
+overhead for a nanosecond computation. These helpers use math.erfc for
+the CDF and the Acklam rational approximation refined with one Halley
+step for the inverse, matching scipy to near machine precision.
+
+They are plain-Python on purpose: basel_kernels.py wraps the very same
+functions with @njit to reuse them inside compiled kernels.
+"""
+import math
+
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)
+_SQRT_2PI = math.sqrt(2.0 * math.pi)
+
+# Acklam inverse-normal-CDF coefficients
+_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+      1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+      6.680131188771972e+01, -1.328068155288572e+01)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+      -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+      3.754408661907416e+00)
+
+
+def norm_cdf(x: float) -> float:
+    """Standard normal CDF via the complementary error function."""
+    return 0.5 * math.erfc(-x * _INV_SQRT2)
+
+
+def norm_ppf(p: float) -> float:
+    """Inverse standard normal CDF (Acklam approximation + one Halley step)."""
+    if p <= 0.0:
+        return -math.inf
+    if p >= 1.0:
+        return math.inf
+
+    p_low = 0.02425
+    if p < p_low:
+        q = math.sqrt(-2.0 * math.log(p))
+        x = ((((( _C[0] * q + _C[1]) * q + _C[2]) * q + _C[3]) * q + _C[4]) * q + _C[5]) / \
+            (((( _D[0] * q + _D[1]) * q + _D[2]) * q + _D[3]) * q + 1.0)
+    elif p <= 1.0 - p_low:
+        q = p - 0.5
+        r = q * q
+        x = ((((( _A[0] * r + _A[1]) * r + _A[2]) * r + _A[3]) * r + _A[4]) * r + _A[5]) * q / \
+            ((((( _B[0] * r + _B[1]) * r + _B[2]) * r + _B[3]) * r + _B[4]) * r + 1.0)
+    else:
+        q = math.sqrt(-2.0 * math.log(1.0 - p))
+        x = -((((( _C[0] * q + _C[1]) * q + _C[2]) * q + _C[3]) * q + _C[4]) * q + _C[5]) / \
+            (((( _D[0] * q + _D[1]) * q + _D[2]) * q + _D[3]) * q + 1.0)
+
+    # One Halley refinement against the erfc-based CDF (machine precision)
+    e = 0.5 * math.erfc(-x * _INV_SQRT2) - p
+    u = e * _SQRT_2PI * math.exp(0.5 * x * x)
+    return x - u / (1.0 + 0.5 * x * u)
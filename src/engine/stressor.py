@@ -1,12 +1,38 @@
+import numpy as np
 import yaml
+from dataclasses import replace
+from functools import lru_cache
 from pathlib import Path
-from scipy.stats import norm
+from typing import Optional
+
 from pydantic import BaseModel
 # Suppression de l'import 'Optional' qui faisait planter la CI
 # Suppression de 'numpy' s'il était là pour rien
+# scipy and the numba kernels are imported lazily inside apply_stress:
+# they cost hundreds of ms of cold import that callers who only load
+# scenarios (CLI startup, non-stress API workers) should not pay.
 
 from src.domain.entities import Portfolio
 
+# Below this size the scipy ufunc pair is already fast enough that the
+# intermediate arrays don't matter; above it the fused parallel kernel wins.
+_KERNEL_THRESHOLD = 10_000
+
+# libyaml C loader when available (3-5x faster parse), stdlib fallback otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+@lru_cache(maxsize=8)
+def _parse_yaml(full_path: Path, mtime: float) -> dict:
+    """
+    Parses the scenario file once per (path, mtime).
+
+    Every StressEngine construction (tests, API workers) used to re-read
+    and re-parse the YAML from disk; keying the cache on the mtime keeps
+    it correct when the file is edited.
+    """
+    with open(full_path, 'r') as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
 class MacroScenario(BaseModel):
     name: str
     description: str
@@ -36,36 +62,64 @@ class StressEngine:
             return default_scenarios
             
         try:
-            with open(full_path, 'r') as f:
-                data = yaml.safe_load(f)
+            data = _parse_yaml(full_path, full_path.stat().st_mtime)
             return {k: MacroScenario(name=k, **v) for k, v in data['scenarios'].items()}
         except Exception as e:
             print(f"Config Error: {e}")
             return default_scenarios
 
-    def apply_stress(self, portfolio: Portfolio, scenario_name: str, sensitivity: float = 1.0) -> Portfolio:
-        # Utilisation de .get() qui renvoie None par défaut, mais on gère le cas juste après
+    def get_scenario(self, scenario_name: str) -> Optional[MacroScenario]:
+        """Resolves a scenario by name, falling back to 'adverse' for unknown names."""
         scenario = self.scenarios.get(scenario_name)
-        
         if scenario is None:
             scenario = self.scenarios.get("adverse")
-            # Sécurité absolue si même "adverse" a disparu (impossible avec le default, mais pour le typage)
-            if scenario is None:
-                 return portfolio 
+        return scenario
 
-        if scenario.shock_factor == 0:
+    def apply_stress_arrays(self, pds: np.ndarray, scenario_name: str, sensitivity: float = 1.0) -> np.ndarray:
+        """
+        Array-in / array-out probit shift: the SoA core of apply_stress.
+
+        Consumers that already hold the portfolio as arrays (the API's
+        bulk path, the Basel kernels) can stress the PD vector directly
+        and never materialize stressed Loan objects. Returns the input
+        array itself when the shift is zero, so identity is detectable
+        with an `is` check. The input is never mutated.
+        """
+        scenario = self.get_scenario(scenario_name)
+        if scenario is None:
+            return pds
+
+        shift = scenario.shock_factor * sensitivity
+        if shift == 0.0:
+            return pds
+
+        # Probit shift vectorized: one ppf/cdf pair over the whole array
+        # instead of two scalar calls per loan. ndtri/ndtr are the raw
+        # Cephes functions norm.ppf/cdf wrap; using them directly skips
+        # the rv_continuous argument-parsing layer.
+        if pds.shape[0] >= _KERNEL_THRESHOLD:
+            # Fused compiled kernel: clip + ppf + shift + cdf in one
+            # parallel pass, no intermediate arrays.
+            from src.domain.basel_kernels import probit_shift
+            out = np.empty_like(pds)
+            probit_shift(pds, shift, out)
+            return out
+        from scipy.special import ndtr, ndtri
+        return ndtr(ndtri(np.clip(pds, 1e-5, 0.999)) + shift)
+
+    def apply_stress(self, portfolio: Portfolio, scenario_name: str, sensitivity: float = 1.0) -> Portfolio:
+        # The PD array comes from the portfolio's cached SoA view, shared
+        # with the metrics computation; apply_stress_arrays never mutates
+        # it, and hands the same array back when the shift is the identity.
+        raw_pds = portfolio.arrays["pd"]
+        stressed_pds = self.apply_stress_arrays(raw_pds, scenario_name, sensitivity)
+        if stressed_pds is raw_pds:
             return portfolio
 
-        new_loans = []
-        for loan in portfolio.loans:
-            stressed_loan = loan.model_copy()
-            
-            pd_safe = max(min(loan.pd, 0.999), 1e-5)
-            z_score = float(norm.ppf(pd_safe))
-            shifted_z = z_score + (scenario.shock_factor * sensitivity)
-            stressed_pd = float(norm.cdf(shifted_z))
-            
-            stressed_loan.pd = stressed_pd
-            new_loans.append(stressed_loan)
-            
-        return Portfolio(loans=new_loans)
+        # replace() skips validation by construction: Loan is a plain
+        # frozen dataclass and the stressed PD is a CDF value in [0, 1].
+        new_loans = [
+            replace(loan, pd=float(stressed_pd))
+            for loan, stressed_pd in zip(portfolio.loans, stressed_pds)
+        ]
+        return Portfolio.model_construct(loans=new_loans)
@@ -1,9 +1,53 @@
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
 from sklearn.base import BaseEstimator, TransformerMixin
 from sklearn.utils.validation import check_is_fitted
 from typing import Any
 
+def _fit_one_col(values: np.ndarray, y_arr: np.ndarray, regularization: float,
+                 total_goods: int, total_bads: int):
+    """
+    WoE statistics for one column; module-level so it stays picklable if
+    the joblib backend is switched from threads to processes.
+
+    Returns (mapping, iv, category index, lookup table, nan bucket woe,
+    sorted string keys, values aligned to the sorted keys).
+    """
+    cat = pd.Categorical(values)
+    # Shift codes by one so the NaN code (-1) lands in bucket 0
+    codes = cat.codes.astype(np.intp) + 1
+    n_buckets = len(cat.categories) + 1
+
+    totals = np.bincount(codes, minlength=n_buckets)
+    bads = np.bincount(codes, weights=y_arr, minlength=n_buckets)
+    goods = totals - bads
+
+    dist_goods = (goods + regularization) / (total_goods + 2 * regularization)
+    dist_bads = (bads + regularization) / (total_bads + 2 * regularization)
+
+    woe_values = np.log(dist_goods / dist_bads)
+
+    # IV over observed buckets only (empty NaN bucket contributes nothing)
+    observed = totals > 0
+    iv = float(((dist_goods - dist_bads) * woe_values)[observed].sum())
+
+    # Category -> WoE mapping; NaN gets its trained bucket when it
+    # appeared during fit, otherwise a neutral 0.0
+    mapping: dict = dict(zip(cat.categories, woe_values[1:]))
+    mapping[np.nan] = float(woe_values[0]) if totals[0] > 0 else 0.0
+
+    # Slot -1 holds the unseen-category default (0.0): get_indexer
+    # returns -1 for unknowns, which gathers the last element.
+    lut = np.append(woe_values[1:], 0.0)
+
+    # Sorted string keys + aligned values for the searchsorted transform
+    # path. Categorical categories come out sorted already; the argsort
+    # only reorders if the string cast changed the relative order.
+    keys = np.asarray(cat.categories, dtype=str)
+    order = np.argsort(keys, kind='stable')
+    return mapping, iv, pd.Index(cat.categories), lut, mapping[np.nan], keys[order], woe_values[1:][order]
+
 class WoeEncoder(BaseEstimator, TransformerMixin):
     """
     Custom Scikit-Learn transformer for Weight of Evidence (WoE) encoding.
@@ -14,6 +58,15 @@ class WoeEncoder(BaseEstimator, TransformerMixin):
         self.regularization = regularization
         self.mapping_: dict[str, dict[str | float, float]] = {}
         self.iv_: dict[str, float] = {}
+        # Lookup-table form of mapping_ used by transform: a category Index
+        # plus an aligned WoE array, so encoding is one get_indexer + gather
+        # per column instead of a per-element dict lookup via Series.map.
+        self._woe_index_: dict[str, pd.Index] = {}
+        self._woe_lut_: dict[str, np.ndarray] = {}
+        self._woe_nan_: dict[str, float] = {}
+        # Sorted-key variant of the LUT for branchless binary-search lookup
+        self._woe_keys_: dict[str, np.ndarray] = {}
+        self._woe_vals_: dict[str, np.ndarray] = {}
 
     def _ensure_dataframe(self, X: Any) -> pd.DataFrame:
         """Ensures input is a DataFrame, even when it is a NumPy array."""
@@ -28,68 +81,112 @@ class WoeEncoder(BaseEstimator, TransformerMixin):
     def fit(self, X: pd.DataFrame, y: pd.Series):
         """
         Computes WoE values for each specified column.
+
+        Aggregation runs on categorical integer codes with np.bincount
+        (one C-level pass per column) instead of a hash-based groupby on
+        an intermediate two-column DataFrame. Columns are independent, so
+        they are fitted in parallel with a thread backend: the bincount /
+        log work releases the GIL, giving near-linear scaling once the
+        scorecard grows beyond a handful of categorical fields.
         """
         X = self._ensure_dataframe(X)
-        
+
         if self.columns is None:
              self.columns = X.columns.tolist()
 
-        total_bads = y.sum()
-        total_goods = y.count() - total_bads
-        
+        # Cast the target once, up front: np.bincount needs float64 weights,
+        # so without this every worker would re-convert y per column.
+        y_arr = np.ascontiguousarray(y, dtype=np.float64)
+        total_bads = int(y_arr.sum())
+        total_goods = y_arr.size - total_bads
+
         if total_bads == 0 or total_goods == 0:
             raise ValueError("Target 'y' must contain both classes 0 and 1.")
 
-        for col in self.columns:
-            df_calc = pd.DataFrame({'feature': X[col], 'target': y})
-            
-            stats = df_calc.groupby('feature', dropna=False)['target'].agg(['count', 'sum'])
-            stats.columns = ['total', 'bads']
-            stats['goods'] = stats['total'] - stats['bads']
-            
-            dist_goods = (stats['goods'] + self.regularization) / (total_goods + 2 * self.regularization)
-            dist_bads = (stats['bads'] + self.regularization) / (total_bads + 2 * self.regularization)
-            
-            woe_values = np.log(dist_goods / dist_bads)
-            
-            iv_contribution = (dist_goods - dist_bads) * woe_values
-            self.iv_[col] = float(iv_contribution.sum())
-            
-            # --- DICTIONARY NORMALIZATION FIX ---
-            d = woe_values.to_dict()
-            
-            # Look for keys representing NaN (np.nan, float('nan'), None...)
-            nan_keys = [k for k in d.keys() if pd.isna(k)]
-            
-            if nan_keys:
-                # If a NaN key already exists (e.g., generated by groupby), normalize the key to np.nan
-                val = d[nan_keys[0]]
-                # Remove all NaN variants to avoid duplicates
-                for k in nan_keys:
-                    del d[k]
-                # Insert a clean NaN key
-                d[np.nan] = val
-            else:
-                # If no NaN category appeared during training, set default WoE value to 0.0
-                d[np.nan] = 0.0
-            
-            self.mapping_[col] = d
+        results = Parallel(n_jobs=-1, prefer='threads')(
+            delayed(_fit_one_col)(
+                X[col].to_numpy(), y_arr, self.regularization, total_goods, total_bads
+            )
+            for col in self.columns
+        )
+
+        for col, (mapping, iv, index, lut, nan_woe, keys, vals) in zip(self.columns, results):
+            self.mapping_[col] = mapping
+            self.iv_[col] = iv
+            self._woe_index_[col] = index
+            self._woe_lut_[col] = lut
+            self._woe_nan_[col] = nan_woe
+            self._woe_keys_[col] = keys
+            self._woe_vals_[col] = vals
 
         return self
 
+    def _encode_column(self, values: np.ndarray, col: str) -> np.ndarray:
+        """
+        Encodes one column of raw category values via binary search.
+
+        np.searchsorted over the sorted key array replaces the hashed
+        Index.get_indexer lookup: O(log K) contiguous string compares per
+        element, no per-object hashing. Misses (unseen categories) fall
+        back to 0.0; NaN entries get their trained bucket.
+        """
+        keys = self._woe_keys_[col]
+        vals = self._woe_vals_[col]
+        if len(keys) == 0:
+            # Fit saw only NaN in this column: there are no categories to
+            # search, and keys[-1] below would index an empty array. Every
+            # value is either the trained NaN bucket or an unseen category
+            # (0.0), matching what Series.map(...).fillna(0.0) produced.
+            # The pipeline's most-frequent imputer masks this for the API
+            # path, but standalone WoeEncoder users hit it directly.
+            return np.where(pd.isna(values), self._woe_nan_[col], 0.0)
+        needles = np.asarray(values, dtype=str)
+        idx = np.minimum(np.searchsorted(keys, needles), len(keys) - 1)
+        encoded = np.where(keys[idx] == needles, vals[idx], 0.0)
+        na_mask = pd.isna(values)
+        if na_mask.any():
+            encoded[na_mask] = self._woe_nan_[col]
+        return encoded
+
     def transform(self, X: pd.DataFrame) -> pd.DataFrame:
         """
         Replaces categories with their corresponding WoE values.
+
+        Each column is encoded with one vectorized Index.get_indexer call
+        and an array gather from the fitted LUT; unseen categories get 0.0
+        and NaN gets its trained bucket, matching the mapping_ contract.
+
+        Encoded columns are written into a single preallocated float64
+        block and wrapped as a DataFrame once at the end, so the caller's
+        frame is never mutated and no per-column dtype promotion happens.
+
+        NumPy input (the common case inside the ColumnTransformer, where
+        the upstream imputer emits a plain ndarray) stays NumPy: columns
+        are indexed positionally and the float64 block is returned as-is,
+        with no DataFrame round-trip on the inference path.
         """
         check_is_fitted(self, 'mapping_')
-        X_out = self._ensure_dataframe(X)
+
+        if isinstance(X, np.ndarray) and self.columns is not None:
+            out = np.empty((X.shape[0], len(self.columns)), dtype=np.float64)
+            for j, col in enumerate(self.columns):
+                out[:, j] = self._encode_column(X[:, j], col)
+            return out
+
+        X_in = self._ensure_dataframe(X)
 
         if self.columns is None:
-             return X_out
-
-        for col in self.columns:
-            if col in X_out.columns:
-                mapped_series = X_out[col].map(self.mapping_[col])
-                X_out[col] = mapped_series.fillna(0.0).astype(float)
-                
-        return X_out
+             return X_in
+
+        cols = [c for c in self.columns if c in X_in.columns]
+        out = np.empty((len(X_in), len(cols)), dtype=np.float64)
+
+        for j, col in enumerate(cols):
+            out[:, j] = self._encode_column(X_in[col].to_numpy(), col)
+
+        result = pd.DataFrame(out, columns=cols, index=X_in.index)
+        passthrough = [c for c in X_in.columns if c not in self.mapping_]
+        if passthrough:
+            result = pd.concat([result, X_in[passthrough]], axis=1)
+            result = result[[c for c in X_in.columns]]
+        return result
@@ -1,4 +1,4 @@
-import pickle
+import joblib
 import pandas as pd
 import numpy as np
 
@@ -7,8 +7,9 @@ MODEL_PATH = "data/models/scorecard_model.pkl"
 def inspect():
     print(f" Loading model from {MODEL_PATH}...")
     
-    with open(MODEL_PATH, "rb") as f:
-        pipeline = pickle.load(f)
+    # mmap_mode shares the model's numpy arrays across processes instead of
+    # deserializing a private copy per load
+    pipeline = joblib.load(MODEL_PATH, mmap_mode='r')
 
     # Access the Logistic Regression model (last step of the pipeline)
     log_reg = pipeline.named_steps['classifier']
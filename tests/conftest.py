@@ -0,0 +1,30 @@
+"""
+Shared test setup.
+
+The session-scoped warmup below touches every Numba kernel once before
+tests run, so JIT compilation (or the on-disk cache load) happens in one
+predictable place instead of inflating the first test that happens to hit
+a kernel. The scalar formulas in basel_formulas stay plain Python — they
+take Loan objects and are memoized, so the compiled layer lives in
+basel_kernels and this warmup doubles as its correctness smoke pass.
+"""
+import numpy as np
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warm_numba_kernels():
+    from src.domain.basel_kernels import aggregate_metrics, probit_shift, vasicek_k, vasicek_k_batch
+
+    pd_arr = np.array([0.01, 0.05])
+    lgd = np.array([0.45, 0.6])
+    ead = np.array([1e5, 2e5])
+    maturity = np.array([2.5, 4.0])
+    etype = np.array([0, 2], dtype=np.int8)
+    turnover = np.array([np.nan, 1e7])
+    out = np.empty(2)
+
+    vasicek_k(0.01, 0.45, 2.5, 0, np.nan)
+    vasicek_k_batch(pd_arr, lgd, maturity, etype, turnover, out)
+    aggregate_metrics(pd_arr, lgd, ead, maturity, etype, turnover)
+    probit_shift(pd_arr, 1.5, out)
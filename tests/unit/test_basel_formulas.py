@@ -1,9 +1,17 @@
+import dataclasses
+import functools
+import math
+
+import numpy as np
 import pytest
 from src.domain.entities import Loan, ExposureType
 from src.domain.basel_formulas import (
     calculate_asset_correlation,
+    calculate_asset_correlation_np,
     vasicek_model_capital,
+    vasicek_model_capital_np,
     calculate_rwa,
+    calculate_rwa_np,
     calculate_expected_loss,
 )
 
@@ -11,55 +19,103 @@ from src.domain.basel_formulas import (
 PD_LOW = 0.005   # 0.5% PD (Good-quality firm)
 PD_HIGH = 0.05   # 5% PD (Risky firm)
 LGD_STANDARD = 0.45  # 45% LGD (standard for unsecured senior loan)
-EAD_LARGE = 1_000_000  # 1 million EAD
+# Floats at module import so fixtures never pay int->float conversion
+EAD_LARGE = 1_000_000.0  # 1 million EAD
+EAD_SME = EAD_LARGE * 0.5
 
-# Fixture (reusable test data)
-@pytest.fixture
-def standard_corporate_loan() -> Loan:
-    """Standard corporate loan for a large entity."""
-    return Loan(
-        id="C001",
-        pd=PD_LOW,
-        lgd=LGD_STANDARD,
-        ead=EAD_LARGE,
-        maturity=2.5,
-        exposure_type=ExposureType.CORPORATE,
-        turnover=100_000_000.0
-    )
+def _bump(loan: Loan, **overrides) -> Loan:
+    """Copy of a loan with fields overridden; Loan is a plain frozen
+    dataclass, so replace() is the C-speed unvalidated copy path."""
+    return dataclasses.replace(loan, **overrides)
 
-@pytest.fixture
-def high_risk_sme_loan() -> Loan:
-    """High-risk SME loan (SME correlation adjustment applied)."""
+# Cached loan factory: one construction per kind for the whole run. Loan
+# is frozen, so sharing the instances across tests is safe.
+@functools.lru_cache(maxsize=None)
+def make_loan(kind: str) -> Loan:
+    if kind == "corporate":
+        # Standard corporate loan for a large entity
+        return Loan(
+            id="C001",
+            pd=PD_LOW,
+            lgd=LGD_STANDARD,
+            ead=EAD_LARGE,
+            maturity=2.5,
+            exposure_type=ExposureType.CORPORATE,
+            turnover=100_000_000.0
+        )
+    # High-risk SME loan (SME correlation adjustment applied)
     return Loan(
         id="SME001",
         pd=PD_HIGH,
         lgd=LGD_STANDARD,
-        ead=EAD_LARGE / 2,
+        ead=EAD_SME,
         maturity=4.0,  # Longer maturity than 2.5 years
         exposure_type=ExposureType.SME,
         turnover=10_000_000.0  # Low turnover → SME adjustment applies
     )
 
+# Fixtures (reusable test data). Session-scoped: the tests only read from
+# the loans (copies are made for variations), so one construction per run
+# is enough.
+@pytest.fixture(scope="session")
+def standard_corporate_loan() -> Loan:
+    return make_loan("corporate")
+
+# PD pairs shared by the monotonicity sweeps below
+PD_PAIRS = [(0.005, 0.05), (0.01, 0.1), (0.02, 0.15), (0.005, 0.20)]
+
 # --- 1. Tests for Correlation Function ---
-def test_correlation_corporate_decreases_with_pd(standard_corporate_loan: Loan):
+@pytest.mark.parametrize("pd_low,pd_high", PD_PAIRS)
+def test_correlation_corporate_decreases_with_pd(standard_corporate_loan: Loan, pd_low: float, pd_high: float):
     """Checks that correlation R decreases when PD increases (Basel-required behavior)."""
-    corr_low_pd = calculate_asset_correlation(standard_corporate_loan)
-    
-    # Simulate a much higher PD
-    high_pd_loan = standard_corporate_loan.model_copy(update={'pd': 0.15})
-    corr_high_pd = calculate_asset_correlation(high_pd_loan)
-    
+    corr_low_pd = calculate_asset_correlation(_bump(standard_corporate_loan, pd=pd_low))
+    corr_high_pd = calculate_asset_correlation(_bump(standard_corporate_loan, pd=pd_high))
+
     # R must decrease when PD increases
     assert corr_low_pd > corr_high_pd
 
-def test_correlation_sme_adjustment(standard_corporate_loan: Loan, high_risk_sme_loan: Loan):
+def test_correlation_monotone_on_pd_grid():
+    """Dense vectorized sweep: R strictly decreases across the whole PD grid.
+
+    One SoA call over 1024 points replaces a per-point Python loop and
+    checks the property everywhere, not just at sampled pairs."""
+    pd_grid = np.linspace(1e-4, 0.3, 1024)
+    not_sme = np.zeros(pd_grid.size, dtype=bool)
+    no_turnover = np.full(pd_grid.size, np.nan)
+
+    r = calculate_asset_correlation_np(pd_grid, not_sme, no_turnover)
+    assert np.all(np.diff(r) < 0)
+
+def test_capital_monotone_on_pd_grid():
+    """K strictly increases with PD over the realistic corporate range.
+
+    The grid stops at 25% PD: beyond ~30% the falling correlation starts
+    to outweigh the rising conditional PD and K legitimately rolls over."""
+    pd_grid = np.linspace(1e-4, 0.25, 1024)
+    not_sme = np.zeros(pd_grid.size, dtype=bool)
+    no_turnover = np.full(pd_grid.size, np.nan)
+
+    k = vasicek_model_capital_np(
+        pd_grid,
+        np.full(pd_grid.size, LGD_STANDARD),
+        np.full(pd_grid.size, 2.5),
+        not_sme,
+        no_turnover,
+    )
+    assert np.all(np.diff(k) > 0)
+
+@pytest.mark.parametrize(
+    "kind,expected_lower",
+    [("corporate", False), ("sme", True)],
+    ids=["corporate", "sme"],
+)
+def test_correlation_sme_adjustment(kind: str, expected_lower: bool):
     """Checks that SME adjustment reduces correlation compared to a standard Corporate."""
-    
-    corporate_corr = calculate_asset_correlation(standard_corporate_loan)
-    sme_corr = calculate_asset_correlation(high_risk_sme_loan)
-    
+    corporate_corr = calculate_asset_correlation(make_loan("corporate"))
+    corr = calculate_asset_correlation(make_loan(kind))
+
     # SME correlation must be lower (SME adjustment reduces R)
-    assert sme_corr < corporate_corr
+    assert (corr < corporate_corr) == expected_lower
 
 # --- 2. Tests for Regulatory Outputs K and RWA ---
 def test_rwa_is_non_zero_and_reasonable(standard_corporate_loan: Loan):
@@ -69,18 +125,39 @@ def test_rwa_is_non_zero_and_reasonable(standard_corporate_loan: Loan):
     # Typical RWA for a good firm is around 20–30% of EAD
     assert 100_000 < rwa < 750_000
 
-def test_capital_increases_with_risk(standard_corporate_loan: Loan):
+def test_rwa_bounds_on_parameter_grid():
+    """RWA stays finite, positive and below the regulatory ceiling over a
+    (PD, LGD) grid, checked in one vectorized sweep.
+
+    The ceiling is 12.5 * LGD * EAD: capital K can never exceed LGD, so
+    any RWA at or above that bound means the formula broke down."""
+    pds = np.array([0.001, 0.005, 0.01, 0.02])
+    lgds = np.array([0.30, 0.45, 0.60])
+    pd_grid, lgd_grid = (a.ravel() for a in np.meshgrid(pds, lgds, indexing="ij"))
+
+    n = pd_grid.size
+    ead = np.full(n, EAD_LARGE)
+    rwa = calculate_rwa_np(
+        pd_grid, lgd_grid, ead,
+        np.full(n, 2.5),
+        np.zeros(n, dtype=bool),
+        np.full(n, np.nan),
+    )
+
+    ceiling = 12.5 * lgd_grid * ead
+    assert np.all(np.isfinite(rwa) & (rwa > 0.0) & (rwa < ceiling))
+
+@pytest.mark.parametrize("pd_low,pd_high", PD_PAIRS)
+def test_capital_increases_with_risk(standard_corporate_loan: Loan, pd_low: float, pd_high: float):
     """Checks that capital K increases with PD (core risk logic)."""
-    k_low = vasicek_model_capital(standard_corporate_loan)
-    
-    # Simulate PD 10x higher
-    high_pd_loan = standard_corporate_loan.model_copy(update={'pd': 0.05})
-    k_high = vasicek_model_capital(high_pd_loan)
-    
+    k_low = vasicek_model_capital(_bump(standard_corporate_loan, pd=pd_low))
+    k_high = vasicek_model_capital(_bump(standard_corporate_loan, pd=pd_high))
+
     assert k_high > k_low
 
 def test_expected_loss_calculation(standard_corporate_loan: Loan):
     """Checks EL calculation: PD * LGD * EAD."""
     el = calculate_expected_loss(standard_corporate_loan)
-    # EL = 0.005 * 0.45 * 1,000,000 = 2,250
-    assert el == pytest.approx(2250.0)
+    # EL = 0.005 * 0.45 * 1,000,000 = 2,250 (exact arithmetic, so a plain
+    # isclose beats pytest.approx's comparison machinery)
+    assert math.isclose(el, 2250.0, rel_tol=1e-12, abs_tol=1e-9)